@@ -7,43 +7,92 @@ Production-ready for high-frequency trading (HFT) execution
 import os
 import sys
 import json
+import hmac
 import time
+import queue
+import atexit
 import logging
 import asyncio
-from datetime import datetime
-from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional, Dict, List, Tuple
-from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import aiohttp
 from dotenv import load_dotenv
 from strategies_optimized import HybridSignalGenerator, SmartRiskManagerV2
+from strategies._njit import njit
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps  # returns bytes at C speed
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+    _json_loads = json.loads
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging with rotation
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('trading_bot.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging: real handlers live behind a queue so file/console I/O
+# runs on a background thread instead of the trading path
+_log_queue = queue.Queue(-1)
+_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    RotatingFileHandler('trading_bot.log', maxBytes=10_000_000, backupCount=5),
+    logging.StreamHandler()
+]
+for _h in _log_handlers:
+    _h.setFormatter(_formatter)
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.basicConfig(level=logging.INFO, handlers=[QueueHandler(_log_queue)])
 logger = logging.getLogger(__name__)
 
+# Cycle banner built once instead of per iteration
+_BANNER70 = '\n' + '=' * 70
+
+
+@njit('f8(f4[::1], i8)', cache=True, fastmath=True, boundscheck=False)
+def _atr_kernel(prices: np.ndarray, period: int) -> float:
+    """Mean absolute price delta over the trailing window - compiled scalar loop"""
+    n = prices.shape[0]
+    s = 0.0
+    for i in range(n - period, n):
+        s += abs(prices[i] - prices[i - 1])
+    return s / period
+
+
+# Keep the @njit dispatcher reachable for _compile_kernels.py - the AOT
+# override below rebinds the public name to a function without .py_func
+_atr_kernel_njit = _atr_kernel
+
+# Prefer the AOT-built extension (strategies/_compile_kernels.py) when present
+try:
+    from strategies._kernels_aot import atr_kernel as _atr_kernel
+except ImportError:
+    pass
+
+# Warm the kernel at import so the one-off JIT compile never lands on a cycle
+_atr_kernel(np.zeros(16, dtype=np.float32), 14)
+
 
 class HybridDeltaBotOptimized:
     """Highly optimized Delta Exchange Trading Bot"""
 
     BASE_URL = 'https://api.delta.exchange'
+    WS_URL = 'wss://socket.delta.exchange'
 
     __slots__ = (
         'api_key', 'api_secret', 'config', 'symbol', 'grid_levels', 'grid_width',
         'risk_pct', 'min_qty', 'cycle_delay', 'min_balance', 'signal_gen',
-        'risk_mgr', 'price_history', 'open_orders', 'session', 'executor',
-        '_price_cache', '_atr_cache', '_grid_cache', '_last_signal_time'
+        'risk_mgr', '_ph', '_ph_idx', '_ph_len', '_ph_scratch', 'open_orders',
+        'session',
+        'product_id', '_price_cache', '_balance_cache', '_atr_cache', '_grid_cache',
+        '_last_signal_time', '_last_now_s', '_now_str', '_buy_mult', '_sell_mult',
+        '_secret_bytes', '_base_headers', '_order_tmpl',
+        '_ws_task', '_last_ws_price', '_last_ws_time'
     )
 
     def __init__(self, config_file='config.json'):
@@ -56,8 +105,8 @@ class HybridDeltaBotOptimized:
             sys.exit(1)
 
         # Load configuration
-        with open(config_file, 'r') as f:
-            self.config = json.load(f)
+        with open(config_file, 'rb') as f:
+            self.config = _json_loads(f.read())
 
         self.symbol = self.config['symbol']
         self.grid_levels = self.config['grid_levels']
@@ -71,81 +120,148 @@ class HybridDeltaBotOptimized:
         self.signal_gen = HybridSignalGenerator()
         self.risk_mgr = SmartRiskManagerV2(self.config.get('initial_capital', 1000))
 
-        # Optimize price history with numpy arrays
-        self.price_history = deque(maxlen=500)
+        # Preallocated price ring buffer - raw float32, no per-sample boxing
+        self._ph = np.empty(500, dtype=np.float32)
+        self._ph_idx = 0
+        self._ph_len = 0
+        self._ph_scratch = np.empty(500, dtype=np.float32)
+
+        # Grid multipliers depend only on config - built once, reused per signal
+        _levels = np.arange(1, self.grid_levels + 1, dtype=np.float32)
+        self._buy_mult = 1 - self.grid_width * _levels
+        self._sell_mult = 1 + self.grid_width * _levels
         self.open_orders = {}
+        self.product_id = None
 
         # Caching for expensive calculations
         self._price_cache = None
+        self._balance_cache = None
         self._atr_cache = None
         self._grid_cache = None
         self._last_signal_time = 0
+        self._last_now_s = 0
+        self._now_str = ''
+
+        # Pre-encoded signing key - hmac.digest takes the one-shot OpenSSL path
+        self._secret_bytes = self.api_secret.encode()
+
+        # Constant header fields built once; per-request copies only add the
+        # signature and timestamp
+        self._base_headers = {
+            'api-key': self.api_key,
+            'Content-Type': 'application/json'
+        }
+
+        # Reusable order payload - only side/quantity/price change per order
+        self._order_tmpl = {
+            'symbol': self.symbol,
+            'order_type': 'limit',
+            'side': None,
+            'quantity': None,
+            'price': None
+        }
 
-        # Thread pool for async operations
-        self.executor = ThreadPoolExecutor(max_workers=3)
         self.session = None
 
-        logger.info(f'Bot initialized: {self.symbol} | Grid: {self.grid_levels}x {self.grid_width*100}%')
+        # WebSocket ticker state - pushed prices beat REST polling
+        self._ws_task = None
+        self._last_ws_price = 0.0
+        self._last_ws_time = 0.0
+
+        logger.info('Bot initialized: %s | Grid: %sx %s%%', self.symbol, self.grid_levels, self.grid_width * 100)
 
     async def init_session(self):
-        """Initialize async HTTP session"""
-        self.session = aiohttp.ClientSession()
+        """Initialize async HTTP session with keep-alive reused across cycles"""
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=16,
+            ttl_dns_cache=300,
+            keepalive_timeout=75,
+            enable_cleanup_closed=True
+        )
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
 
     async def close_session(self):
         """Close async HTTP session"""
         if self.session:
             await self.session.close()
 
-    def _get_signature(self, timestamp: str, method: str, path: str, body: str = '') -> str:
-        """Generate API signature - optimized with pre-computed encoding"""
-        import hmac
-        import hashlib
-
-        message = f'{timestamp}.{method}.{path}'
+    def _get_signature(self, timestamp: str, method: str, path: str, body: bytes = b'') -> str:
+        """Generate API signature - one-shot C implementation via hmac.digest"""
+        message = f'{timestamp}.{method}.{path}'.encode()
         if body:
-            message += f'.{body}'
+            message += b'.' + body
 
-        return hmac.new(
-            self.api_secret.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        return hmac.digest(self._secret_bytes, message, 'sha256').hex()
 
     async def _request_async(self, method: str, endpoint: str, data: Optional[Dict] = None) -> Optional[Dict]:
         """Make async API request - non-blocking"""
         timestamp = str(int(time.time() * 1000))
         path = f'/v2{endpoint}'
-        body = json.dumps(data) if data else ''
+        body = _json_dumps(data) if data else b''
 
         sig = self._get_signature(timestamp, method, path, body)
-        headers = {
-            'api-key': self.api_key,
-            'signature': sig,
-            'timestamp': timestamp,
-            'Content-Type': 'application/json'
-        }
+        headers = {**self._base_headers, 'signature': sig, 'timestamp': timestamp}
 
         url = f'{self.BASE_URL}{path}'
 
         try:
-            async with self.session.request(method, url, headers=headers, data=body, timeout=10) as resp:
+            async with self.session.request(method, url, headers=headers, data=body) as resp:
                 if resp.status == 200:
-                    result = await resp.json()
+                    result = _json_loads(await resp.read())
                     return result.get('data', {})
         except asyncio.TimeoutError:
-            logger.warning(f'Timeout: {method} {endpoint}')
+            logger.warning('Timeout: %s %s', method, endpoint)
         except Exception as e:
-            logger.error(f'API Error: {e}')
+            logger.error('API Error: %s', e)
 
         return None
 
+    async def _ws_reader(self) -> None:
+        """Background task: keep the last ticker price fresh from the WS stream"""
+        subscribe = {
+            'type': 'subscribe',
+            'payload': {'channels': [{'name': 'v2/ticker', 'symbols': [self.symbol]}]}
+        }
+
+        while True:
+            try:
+                async with self.session.ws_connect(self.WS_URL, heartbeat=30) as ws:
+                    await ws.send_json(subscribe)
+                    async for msg in ws:
+                        if msg.type != aiohttp.WSMsgType.TEXT:
+                            break
+                        tick = _json_loads(msg.data)
+                        price = tick.get('close') or tick.get('last_price')
+                        if price:
+                            self._last_ws_price = float(price)
+                            self._last_ws_time = time.time()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning('WS ticker error: %s', e)
+
+            await asyncio.sleep(5)
+
     async def get_balance_async(self) -> float:
-        """Get account balance - async version"""
+        """Get account balance - 5s cache, balance only moves when orders fill"""
+        if self._balance_cache and time.time() - self._balance_cache[1] < 5:
+            return self._balance_cache[0]
+
         data = await self._request_async('GET', '/account/balance')
-        return float(data.get('available_balance', 0)) if data else 0
+        balance = float(data.get('available_balance', 0)) if data else 0
+        if balance:
+            self._balance_cache = (balance, time.time())
+        return balance
 
     async def get_price_async(self) -> float:
-        """Get current price - async with caching"""
+        """Get current price - WS push when fresh, REST fallback otherwise"""
+        if self._last_ws_price and time.time() - self._last_ws_time < 5:
+            return self._last_ws_price
+
         if self._price_cache and time.time() - self._price_cache[1] < 1:
             return self._price_cache[0]
 
@@ -156,40 +272,69 @@ class HybridDeltaBotOptimized:
             return price
         return 0
 
-    def calculate_atr_vectorized(self, period: int = 14) -> float:
-        """Calculate ATR using numpy vectorization - 10x faster"""
-        if len(self.price_history) < period:
+    def append_price(self, price: float) -> None:
+        """Write one sample into the ring buffer"""
+        self._ph[self._ph_idx] = price
+        self._ph_idx = (self._ph_idx + 1) % 500
+        self._ph_len = min(self._ph_len + 1, 500)
+
+    def prices_tail(self, n: int) -> np.ndarray:
+        """Most recent n samples, oldest first - zero-copy unless the ring wraps"""
+        n = min(n, self._ph_len)
+        end = self._ph_idx
+        if self._ph_len < 500 or end >= n:
+            return self._ph[end - n:end]
+
+        # Wrapped window: assemble into the persistent scratch buffer instead
+        # of allocating a fresh array every cycle
+        head = n - end
+        out = self._ph_scratch[:n]
+        out[:head] = self._ph[500 - head:]
+        out[head:] = self._ph[:end]
+        return out
+
+    def _now_string(self) -> str:
+        """Second-resolution timestamp, reformatted only when the second ticks"""
+        now_s = int(time.time())
+        if now_s != self._last_now_s:
+            self._now_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now_s))
+            self._last_now_s = now_s
+        return self._now_str
+
+    def calculate_atr_vectorized(self, period: int = 14,
+                                 prices: Optional[np.ndarray] = None) -> float:
+        """Calculate ATR with a compiled scalar kernel - no temporaries
+
+        Callers already holding a prices_tail view must pass it in: a second
+        prices_tail call can reuse the shared scratch buffer when the ring
+        has wrapped, silently overwriting the first view.
+        """
+        if self._ph_len < period + 1:
             return 30
 
-        prices = np.array(list(self.price_history), dtype=np.float32)
-        deltas = np.diff(prices[-period:])
-        tr = np.abs(deltas)
-
-        return float(np.mean(tr)) if len(tr) > 0 else 30
+        window = prices[-(period + 1):] if prices is not None else self.prices_tail(period + 1)
+        return float(_atr_kernel(window, period))
 
     def calculate_grid_vectorized(self, price: float) -> Tuple[List[float], List[float]]:
         """Calculate grid using numpy - batch processing"""
         if self._grid_cache and self._grid_cache[0] == price:
             return self._grid_cache[1:3]
 
-        levels = np.arange(1, self.grid_levels + 1, dtype=np.float32)
-        multipliers = 1 - (self.grid_width * levels)
-
-        buys = np.round(price * multipliers, 2).tolist()
-        sells = np.round(price * (1 + self.grid_width * levels), 2).tolist()
+        buys = np.round(price * self._buy_mult, 2).tolist()
+        sells = np.round(price * self._sell_mult, 2).tolist()
 
         self._grid_cache = (price, buys, sells, time.time())
         return buys, sells
 
     async def place_order_async(self, side: str, price: float, qty: float) -> Optional[Dict]:
         """Place order asynchronously"""
-        payload = {
-            'symbol': self.symbol,
-            'side': side.upper(),
-            'quantity': qty,
-            'price': round(price, 2),
-            'order_type': 'limit'
-        }
+        # Mutating the shared template is safe: _request_async serializes the
+        # body before its first await, so concurrent placements cannot interleave
+        # Grid prices arrive pre-rounded from calculate_grid_vectorized
+        payload = self._order_tmpl
+        payload['side'] = side.upper()
+        payload['quantity'] = qty
+        payload['price'] = price
 
         result = await self._request_async('POST', '/orders', payload)
         if result:
@@ -200,12 +345,69 @@ class HybridDeltaBotOptimized:
                 'qty': qty,
                 'time': time.time()
             }
-            logger.info(f'✅ {side.upper()} {qty} @ ${price:.2f}')
+            logger.info('✅ %s %s @ $%.2f', side.upper(), qty, price)
             return result
         return None
 
+    async def place_orders_batch_async(self, side: str, prices: List[float], qty: float) -> Optional[int]:
+        """Place a whole grid side with one signed request - 1 RTT, 1 HMAC
+
+        Returns None when the request itself failed (safe to retry order by
+        order) and an int count when the exchange answered. A successful
+        response we cannot parse still returns 0 - the orders may well be
+        live, so retrying would double-place them.
+        """
+        side_u = side.upper()
+        orders = [
+            {'symbol': self.symbol, 'side': side_u, 'quantity': qty,
+             'price': p, 'order_type': 'limit'}
+            for p in prices
+        ]
+
+        result = await self._request_async('POST', '/orders/batch', {'orders': orders})
+        if result is None:
+            return None
+
+        if isinstance(result, dict):
+            result = result.get('orders')
+        if not isinstance(result, list):
+            logger.error('Batch %s: response accepted but no order list to parse - '
+                         'reconcile via /orders/active before re-placing', side_u)
+            return 0
+
+        now = time.time()
+        placed = 0
+        for o in result:
+            self.open_orders[o.get('id')] = {
+                'side': side,
+                'price': o.get('price'),
+                'qty': qty,
+                'time': now
+            }
+            placed += 1
+
+        if placed:
+            logger.info('✅ Batch %s: %s orders', side_u, placed)
+        return placed
+
+    async def resolve_product_id_async(self) -> None:
+        """Resolve numeric product id for the symbol - one call at startup"""
+        products = await self._request_async('GET', '/products?contract_types=perpetual_futures')
+        if isinstance(products, list):
+            for p in products:
+                if p.get('symbol') == self.symbol:
+                    self.product_id = p.get('id')
+                    logger.info('Resolved %s -> product_id %s', self.symbol, self.product_id)
+                    return
+
     async def cancel_all_orders_async(self) -> None:
-        """Cancel all open orders concurrently"""
+        """Cancel all open orders - bulk endpoint, one round-trip"""
+        if self.product_id:
+            result = await self._request_async('DELETE', '/orders/all', {'product_id': self.product_id})
+            if result is not None:
+                return
+
+        # Fallback: cancel per-order when bulk cancel is unavailable
         orders = await self._request_async('GET', '/orders/active')
         if not isinstance(orders, list):
             return
@@ -215,51 +417,60 @@ class HybridDeltaBotOptimized:
             for o in orders if o.get('symbol') == self.symbol
         ]
 
-        await asyncio.gather(*tasks)
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def execute_strategy_async(self, price: float, balance: float) -> Tuple[Optional[str], float]:
         """Execute ML strategies with async support"""
-        if len(self.price_history) < 50:
+        if self._ph_len < 50:
             return None, 0
 
-        prices = np.array(list(self.price_history), dtype=np.float32)
-        atr = self.calculate_atr_vectorized()
+        prices = self.prices_tail(self._ph_len)
+        # Slice the ATR window out of the view we already hold - a fresh
+        # prices_tail call could alias the scratch backing this array
+        atr = self.calculate_atr_vectorized(prices=prices)
 
-        # Run signal generation in thread pool
-        signal_result = await asyncio.get_event_loop().run_in_executor(
-            self.executor,
-            self.signal_gen.generate_consensus,
-            prices.tolist(),
-            atr,
-            balance
-        )
+        # Compiled kernels finish in microseconds - the executor round-trip
+        # would cost more than the strategy work, so call inline
+        signal_result = self.signal_gen.generate_consensus(prices, atr, balance)
 
         return signal_result['consensus'], signal_result['confidence']
 
     async def run_async(self):
         """Main async bot loop - non-blocking execution"""
         await self.init_session()
+        await self.resolve_product_id_async()
+        self._ws_task = asyncio.create_task(self._ws_reader())
         cycle = 0
+        cycle_delay = self.cycle_delay  # hoisted: LOAD_FAST beats LOAD_ATTR per loop
+        loop = asyncio.get_running_loop()
+        next_t = loop.time()
 
         try:
             while True:
+                # Fixed-period schedule on the monotonic clock: the work done in
+                # a cycle no longer drifts the cycle cadence
+                next_t += cycle_delay
                 cycle += 1
-                logger.info(f'\n{"="*70}')
-                logger.info(f'CYCLE {cycle} | {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
-
-                # Parallel API calls
-                balance_task = self.get_balance_async()
-                price_task = self.get_price_async()
-
-                balance, price = await asyncio.gather(balance_task, price_task)
+                logger.info(_BANNER70)
+                logger.info('CYCLE %s | %s', cycle, self._now_string())
+
+                # Skip the gather when the WS stream can answer the price -
+                # no point scheduling a coroutine just to hit its cache
+                if self._last_ws_price and time.time() - self._last_ws_time < 5:
+                    price = self._last_ws_price
+                    balance = await self.get_balance_async()
+                else:
+                    balance, price = await asyncio.gather(
+                        self.get_balance_async(), self.get_price_async()
+                    )
 
                 if balance < self.min_balance or price == 0:
-                    logger.warning(f'Skip cycle - Balance: ${balance:.2f}, Price: ${price:.2f}')
-                    await asyncio.sleep(self.cycle_delay)
+                    logger.warning('Skip cycle - Balance: $%.2f, Price: $%.2f', balance, price)
+                    await asyncio.sleep(max(0.0, next_t - loop.time()))
                     continue
 
-                logger.info(f'💰 ${balance:.2f} | 📈 ${price:.2f}')
-                self.price_history.append(price)
+                logger.info('💰 $%.2f | 📈 $%.2f', balance, price)
+                self.append_price(price)
 
                 # Execute strategy
                 signal, confidence = await self.execute_strategy_async(price, balance)
@@ -272,26 +483,32 @@ class HybridDeltaBotOptimized:
                     qty = self.calculate_qty(balance, price)
                     atr = self.calculate_atr_vectorized()
 
-                    logger.info(f'\n📍 Grid: {signal} | Qty: {qty:.4f} | ATR: ${atr:.2f}')
+                    logger.info('\n📍 Grid: %s | Qty: %.4f | ATR: $%.2f', signal, qty, atr)
 
-                    # Batch order placement
+                    # Batch order placement - one signed request for the side
                     orders = buys if signal == 'UP' else sells
-                    tasks = [
-                        self.place_order_async('buy' if signal == 'UP' else 'sell', p, qty)
-                        for p in orders
-                    ]
-
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-                    placed = sum(1 for r in results if r and not isinstance(r, Exception))
-                    logger.info(f'✅ Placed {placed} orders')
+                    side = 'buy' if signal == 'UP' else 'sell'
+
+                    placed = await self.place_orders_batch_async(side, orders, qty)
+                    if placed is None:
+                        # Fallback only when the batch request itself failed -
+                        # an accepted-but-unparsed response may have placed
+                        # every order already, so re-sending would double them
+                        tasks = [self.place_order_async(side, p, qty) for p in orders]
+                        results = await asyncio.gather(*tasks, return_exceptions=True)
+                        placed = sum(1 for r in results if r and not isinstance(r, Exception))
+
+                    logger.info('✅ Placed %s orders', placed)
                 else:
                     logger.info('⏸️ No high-confidence signal')
 
-                await asyncio.sleep(self.cycle_delay)
+                await asyncio.sleep(max(0.0, next_t - loop.time()))
 
         except KeyboardInterrupt:
             logger.info('\n⏹️ Bot stopped')
         finally:
+            if self._ws_task:
+                self._ws_task.cancel()
             await self.close_session()
 
     def calculate_qty(self, balance: float, price: float) -> float:
@@ -303,6 +520,12 @@ class HybridDeltaBotOptimized:
 
     def run(self):
         """Synchronous wrapper for async run"""
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass  # uvloop is POSIX-only; the default loop works everywhere
+
         asyncio.run(self.run_async())
 
 
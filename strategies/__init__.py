@@ -0,0 +1 @@
+"""Trading strategy modules"""
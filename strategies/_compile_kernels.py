@@ -0,0 +1,38 @@
+"""AOT-compile the trading kernels: python strategies/_compile_kernels.py
+
+Produces a _kernels_aot extension module next to this file. The import sites in
+main_optimized.py and strategies_optimized.py pick it up when present and
+fall back to the @njit versions otherwise, so building it is optional - it
+only removes the first-call JIT compile stall at bot startup.
+
+Requires numba>=0.58,<0.61: numba.pycc was removed in 0.61.
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from numba.pycc import CC
+
+# Import the *_njit aliases: the public names get rebound to the compiled
+# extension once it exists, and those functions carry no .py_func, which
+# would break rebuilding
+from main_optimized import _atr_kernel_njit
+from strategies_optimized import _ml_features_kernel_njit, _signals_kernel_njit
+from strategies._kernels import _compute_features_njit, _bb_and_vol_njit
+
+cc = CC('_kernels_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+cc.verbose = True
+
+# .py_func unwraps the njit dispatcher back to the plain Python function
+cc.export('atr_kernel', 'f8(f4[:], i8)')(_atr_kernel_njit.py_func)
+cc.export('ml_features_kernel', 'void(f4[:], f4[:])')(_ml_features_kernel_njit.py_func)
+cc.export('signals_kernel', 'i1[:](f4[:], f4[:], f4[:], f4[:])')(_signals_kernel_njit.py_func)
+cc.export('compute_features', 'void(f8[:], f8[:])')(_compute_features_njit.py_func)
+cc.export('bb_and_vol', 'UniTuple(f8, 4)(f8[:], i8, f8)')(_bb_and_vol_njit.py_func)
+
+
+if __name__ == '__main__':
+    cc.compile()
+    print('Built _kernels_aot extension')
@@ -0,0 +1,135 @@
+"""Fused @njit indicator kernels shared by the V2 strategy modules"""
+import numpy as np
+
+try:
+    from strategies._njit import njit
+except ImportError:
+    from _njit import njit
+
+
+@njit(cache=True, fastmath=True)
+def _compute_features(prices, out):
+    """SMA ratios, RSI, MACD, momentum, volatility and trend strength in one pass
+
+    Writes six features into ``out`` in the same order MLPredictorV2 used:
+    [sma20 ratio, rsi/100, macd ratio, momentum, volatility, trend strength].
+    """
+    n = prices.shape[0]
+    last = prices[n - 1]
+
+    total = 0.0
+    for i in range(n):
+        total += prices[i]
+    mean_all = total / n
+
+    s20 = 0.0
+    for i in range(n - 20, n):
+        s20 += prices[i]
+    sma_20 = s20 / 20.0
+
+    if n >= 50:
+        s50 = 0.0
+        for i in range(n - 50, n):
+            s50 += prices[i]
+        sma_50 = s50 / 50.0
+    else:
+        sma_50 = mean_all
+
+    # 1. Price vs SMA20 (trend)
+    out[0] = (last - sma_20) / sma_20
+
+    # 2. RSI over the last 14 deltas
+    up = 0.0
+    down = 0.0
+    for i in range(n - 14, n):
+        d = prices[i] - prices[i - 1]
+        if d >= 0.0:
+            up += d
+        else:
+            down -= d
+    rs = (up / 14.0) / (down / 14.0 + 1e-9)
+    out[1] = (100.0 - 100.0 / (1.0 + rs)) / 100.0
+
+    # 3. MACD (trend strength)
+    s12 = 0.0
+    for i in range(n - 12, n):
+        s12 += prices[i]
+    s26 = 0.0
+    for i in range(n - 26, n):
+        s26 += prices[i]
+    ema_12 = (s12 / 12.0) * 0.15 + mean_all * 0.85
+    ema_26 = (s26 / 26.0) * 0.07 + mean_all * 0.93
+    out[2] = (ema_12 - ema_26) / (last + 1e-9)
+
+    # 4. Momentum (short-term direction)
+    out[3] = (last - prices[n - 10]) / prices[n - 10]
+
+    # 5. Volatility: std of the last 19 deltas over the 20-bar mean
+    ds = 0.0
+    ds2 = 0.0
+    for i in range(n - 19, n):
+        d = prices[i] - prices[i - 1]
+        ds += d
+        ds2 += d * d
+    dmean = ds / 19.0
+    dvar = ds2 / 19.0 - dmean * dmean
+    if dvar < 0.0:
+        dvar = 0.0
+    out[4] = np.sqrt(dvar) / sma_20
+
+    # 6. Trend strength (SMA20 vs SMA50 divergence)
+    out[5] = abs(sma_20 - sma_50) / sma_50 if sma_50 != 0.0 else 0.0
+
+
+@njit(cache=True, fastmath=True)
+def _bb_and_vol(prices, period, std_mult):
+    """Bollinger bands and delta volatility fused into a single pass
+
+    Returns (upper, sma, lower, volatility) from one walk over the last
+    ``period`` prices, accumulating sum/sum-of-squares for both the price
+    series and its first differences.
+    """
+    n = prices.shape[0]
+    s = 0.0
+    s2 = 0.0
+    ds = 0.0
+    ds2 = 0.0
+    for i in range(n - period, n):
+        p = prices[i]
+        s += p
+        s2 += p * p
+        if i > n - period:
+            d = p - prices[i - 1]
+            ds += d
+            ds2 += d * d
+    mean = s / period
+    var = s2 / period - mean * mean
+    if var < 0.0:
+        var = 0.0
+    band = np.sqrt(var) * std_mult
+    m = period - 1.0
+    dmean = ds / m
+    dvar = ds2 / m - dmean * dmean
+    if dvar < 0.0:
+        dvar = 0.0
+    vol = np.sqrt(dvar) / mean if mean != 0.0 else 0.0
+    return mean + band, mean, mean - band, vol
+
+
+# Keep the @njit dispatchers reachable for _compile_kernels.py - the AOT
+# override below rebinds the public names to functions without .py_func
+_compute_features_njit = _compute_features
+_bb_and_vol_njit = _bb_and_vol
+
+# Prefer the AOT-built extension (strategies/_compile_kernels.py) when present
+try:
+    from strategies._kernels_aot import (
+        compute_features as _compute_features,
+        bb_and_vol as _bb_and_vol,
+    )
+except ImportError:
+    pass
+
+# Warm the JIT cache once at import so the first live call doesn't stall
+_compute_features(np.linspace(1.0, 2.0, 64), np.empty(6))
+_bb_and_vol(np.linspace(1.0, 2.0, 64), 20, 2.0)
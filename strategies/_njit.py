@@ -0,0 +1,12 @@
+"""Numba njit shim - degrades to a no-op decorator when numba is missing"""
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Fallback decorator: run kernels as plain Python (slower, same results)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def wrapper(func):
+            return func
+        return wrapper
@@ -14,7 +14,8 @@ class MLPredictor:
     def calculate_indicators(self, prices):
         if len(prices) < 30:
             return None
-        prices = np.array(prices)
+        # asarray: no copy when the caller already passes a float64 ndarray
+        prices = np.asarray(prices, dtype=np.float64)
         features = []
         
         sma_20 = np.mean(prices[-20:])
